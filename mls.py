@@ -1,11 +1,24 @@
-import json
 import os
 import time
+import asyncio
+import hashlib
+import heapq
+import diskcache
+import httpx
+import ijson
+import orjson
 import requests
 import logging
 import argparse
-from typing import Dict, List, Any
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Dict, List, Any, Iterable
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from requests_cache.cache_keys import create_key
+from urllib3.util import Retry
 
 # Configure logging
 logging.basicConfig(
@@ -14,61 +27,214 @@ logging.basicConfig(
 )
 logger = logging.getLogger('real_estate_analyzer')
 
+# (connect, read) timeouts in seconds; inference is slow so Hugging Face gets a longer read timeout
+DEFAULT_TIMEOUT = (3.05, 30)
+HF_TIMEOUT = (3.05, 120)
+
+
+def _retry_policy(retry_reads=True):
+    """Retry transient failures with exponential backoff, returning the last response when retries run out
+    
+    With retry_reads off, read errors (including read timeouts) fail straight away while
+    connection errors and 429/5xx responses are still retried.
+    """
+    return Retry(
+        total=3,
+        read=None if retry_reads else 0,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET', 'OPTIONS', 'POST'],
+        raise_on_status=False
+    )
+
+
+HF_MODEL_URL = 'https://api-inference.huggingface.co/models/mistralai/Mistral-7B-Instruct-v0.2'
+HF_GENERATION_PARAMETERS = {
+    'max_new_tokens': 1000,
+    'min_new_tokens': 100,
+    'temperature': 0.7,
+    'top_p': 0.9,
+    'repetition_penalty': 1.1
+}
+
+# Local cache of generated analyses, keyed on a hash of the prompt; opened on first use
+HF_CACHE_DIR = '.hf_cache'
+HF_CACHE_EXPIRE = 86400
+_hf_cache = None
+
+# Shared session so back-to-back analyses reuse the Hugging Face TLS connection
+HF_SESSION = requests.Session()
+HF_SESSION.headers['Accept-Encoding'] = 'gzip, deflate'
+# A read timeout there means the model hung for the full HF_TIMEOUT, so don't wait through it again
+HF_SESSION.mount('https://', HTTPAdapter(pool_maxsize=4, max_retries=_retry_policy(retry_reads=False)))
+
+
+def _json_loads(response):
+    """Decode a JSON response body with orjson"""
+    return orjson.loads(response.content)
+
+
+def _stream_items(response):
+    """Yield the elements of a streamed JSON array response, then release the connection"""
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, 'item', use_float=True)
+    try:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            parser.send(chunk)
+            yield from items
+            del items[:]
+        parser.close()
+        yield from items
+    finally:
+        response.close()
+
+
+def _json_dumps(data):
+    """Encode data as an indented JSON string"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+
+def _write_json(path, data):
+    """Write data to a file as indented JSON"""
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+
+
 class SimplyRetsAPI:
     """
     Client for interacting with the SimplyRETS API
     """
-    def __init__(self, username=None, password=None):
+    # Largest page size the SimplyRETS API accepts
+    MAX_PAGE_SIZE = 500
+    
+    # Seconds to keep cached responses; feed metadata changes far less often
+    CACHE_EXPIRE = 300
+    METADATA_CACHE_EXPIRE = 3600
+    
+    def __init__(self, username=None, password=None, use_cache=True):
         """Initialize the API client with credentials"""
         # Get credentials from environment variables if not provided
         self.username = username or os.environ.get('SIMPLYRETS_USERNAME', 'simplyrets')
         self.password = password or os.environ.get('SIMPLYRETS_PASSWORD', 'simplyrets')
         self.base_url = "https://api.simplyrets.com"
         
-    def get_properties(self, params=None):
+        # Reuse one pooled session so repeated calls share TCP/TLS connections,
+        # and cache responses on disk so repeated runs skip the network; with the
+        # cache off, an in-memory backend keeps the database file from being created
+        self.session = CachedSession(
+            'simplyrets_cache',
+            backend='sqlite' if use_cache else 'memory',
+            expire_after=self.CACHE_EXPIRE,
+            cache_control=True,
+            allowable_methods=('GET', 'OPTIONS'),
+            key_fn=self._cache_key
+        )
+        self.session.settings.disabled = not use_cache
+        self.session.auth = (self.username, self.password)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=_retry_policy()
+        )
+        self.session.mount('https://', adapter)
+        
+    def _cache_key(self, request, **kwargs):
+        """Build a cache key from method, URL and params, scoped to the API account"""
+        # The default key ignores the Authorization header, so add the account explicitly
+        return f"{self.username}:{create_key(request, **kwargs)}"
+        
+    def _get_page(self, url, params=None):
         """
-        Get properties from the SimplyRETS API
+        Get a single page of properties from the SimplyRETS API
+        
+        With the response cache disabled the body is streamed, so the returned
+        properties are parsed lazily as they are iterated rather than loaded
+        into memory up front. With caching on, requests_cache reads the whole
+        body to store it anyway, so the page is decoded in one go instead.
         
         Args:
-            params (dict): Query parameters for filtering properties
+            url (str): Page URL (the base endpoint or a pagination link)
+            params (dict, optional): Query parameters for the request
         
         Returns:
-            list: List of property objects
+            tuple: (iterator of property objects, URL of the next page or None)
         """
-        url = f"{self.base_url}/properties"
-        
-        # Default parameters if none provided
-        if params is None:
-            params = {
-                "limit": 25,
-                "sort": "listprice"
-            }
-        
         try:
             logger.info(f"Making SimplyRETS API request to {url} with params: {params}")
-            response = requests.get(
+            # Streaming only saves memory when nothing has to buffer the body for the cache
+            stream = self.session.settings.disabled
+            response = self.session.get(
                 url,
-                auth=(self.username, self.password),
-                params=params
+                params=params,
+                stream=stream,
+                timeout=DEFAULT_TIMEOUT
             )
             
             logger.info(f"SimplyRETS response status code: {response.status_code}")
             
             if response.status_code == 200:
-                properties = response.json()
-                logger.info(f"Successfully retrieved {len(properties)} properties")
-                return properties
+                next_url = response.links.get('next', {}).get('url')
+                if stream:
+                    return _stream_items(response), next_url
+                return iter(_json_loads(response)), next_url
             elif response.status_code == 401:
                 logger.error("Authentication failed. Please check your SimplyRETS credentials.")
                 raise ValueError("Authentication failed. Please check your SimplyRETS credentials.")
             else:
                 logger.error(f"Error: {response.status_code}, Response: {response.text}")
-                return []
+                return [], None
                 
         except Exception as e:
             logger.error(f"Error fetching properties: {str(e)}")
             raise
     
+    def iter_properties(self, params=None):
+        """
+        Iterate over pages of properties from the SimplyRETS API
+        
+        Follows the pagination links in the response Link header until
+        params["limit"] properties have been returned or no pages remain.
+        
+        Args:
+            params (dict): Query parameters for filtering properties
+        
+        Yields:
+            iterator: One page of property objects, parsed lazily
+        """
+        # Default parameters if none provided
+        if params is None:
+            params = {
+                "limit": 25,
+                "sort": "listprice"
+            }
+        
+        remaining = params.get("limit", 25)
+        page_size = min(remaining, self.MAX_PAGE_SIZE)
+        params = dict(params, limit=page_size)
+        next_url = f"{self.base_url}/properties"
+        
+        while next_url and remaining > 0:
+            page, next_url = self._get_page(next_url, params)
+            # Pagination links already carry the query string
+            params = None
+            
+            # Only the last page can run past the limit; a page is full whenever
+            # another one follows it, so the count is known without parsing
+            yield islice(page, remaining)
+            remaining -= page_size
+    
+    def get_properties(self, params=None):
+        """
+        Get properties from the SimplyRETS API
+        
+        Args:
+            params (dict): Query parameters for filtering properties
+        
+        Returns:
+            list: List of property objects
+        """
+        return [prop for page in self.iter_properties(params) for prop in page]
+    
     def get_property_by_id(self, mls_id):
         """
         Get a specific property by its MLS ID
@@ -82,13 +248,10 @@ class SimplyRetsAPI:
         url = f"{self.base_url}/properties/{mls_id}"
         
         try:
-            response = requests.get(
-                url,
-                auth=(self.username, self.password)
-            )
+            response = self.session.get(url, timeout=DEFAULT_TIMEOUT)
             
             if response.status_code == 200:
-                return response.json()
+                return _json_loads(response)
             else:
                 logger.error(f"Error retrieving property {mls_id}: {response.status_code}, {response.text}")
                 return None
@@ -114,16 +277,17 @@ class SimplyRetsAPI:
             
         try:
             logger.info(f"Making OPTIONS request to {url}")
-            response = requests.options(
+            response = self.session.options(
                 url,
-                auth=(self.username, self.password),
-                params=params
+                params=params,
+                expire_after=self.METADATA_CACHE_EXPIRE,
+                timeout=DEFAULT_TIMEOUT
             )
             
             logger.info(f"OPTIONS request response status code: {response.status_code}")
             
             if response.status_code == 200:
-                return response.json()
+                return _json_loads(response)
             else:
                 logger.error(f"Error retrieving metadata: {response.status_code}, {response.text}")
                 return {}
@@ -133,12 +297,97 @@ class SimplyRetsAPI:
             return {}
 
 
-def extract_property_data(properties: List[Dict]) -> List[Dict]:
+class AsyncSimplyRetsAPI:
+    """
+    Asynchronous client for fetching many SimplyRETS properties concurrently
+    
+    Uses HTTP/2 so concurrent requests are multiplexed over a single TLS connection.
+    """
+    def __init__(self, username=None, password=None):
+        """Initialize the API client with credentials"""
+        self.username = username or os.environ.get('SIMPLYRETS_USERNAME', 'simplyrets')
+        self.password = password or os.environ.get('SIMPLYRETS_PASSWORD', 'simplyrets')
+        self.base_url = "https://api.simplyrets.com"
+        self.client = None
+        
+    async def __aenter__(self):
+        """Open the shared HTTP client"""
+        self.client = httpx.AsyncClient(
+            auth=(self.username, self.password),
+            base_url=self.base_url,
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT[1], connect=DEFAULT_TIMEOUT[0]),
+            # Retries here cover connection failures; httpx has no status-based retry
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the shared HTTP client"""
+        await self.client.aclose()
+        self.client = None
+        
+    async def get_property_by_id(self, mls_id):
+        """
+        Get a specific property by its MLS ID
+        
+        Args:
+            mls_id (str): The MLS ID of the property
+            
+        Returns:
+            dict: Property details or None if not found
+        """
+        try:
+            response = await self.client.get(f"/properties/{mls_id}")
+            
+            if response.status_code == 200:
+                return _json_loads(response)
+            else:
+                logger.error(f"Error retrieving property {mls_id}: {response.status_code}, {response.text}")
+                return None
+                
+        except Exception as e:
+            logger.error(f"Error retrieving property {mls_id}: {str(e)}")
+            return None
+    
+    async def get_properties_bulk(self, mls_ids):
+        """
+        Get several properties by MLS ID, issuing the requests concurrently
+        
+        Args:
+            mls_ids (list): MLS IDs of the properties
+            
+        Returns:
+            list: Property details (or None if not found) in the same order as mls_ids
+        """
+        return await asyncio.gather(*(self.get_property_by_id(mls_id) for mls_id in mls_ids))
+
+
+async def fetch_properties_bulk(mls_ids, username=None, password=None):
+    """
+    Fetch several properties by MLS ID concurrently
+    
+    Args:
+        mls_ids (list): MLS IDs of the properties
+        username (str, optional): SimplyRETS API username
+        password (str, optional): SimplyRETS API password
+        
+    Returns:
+        list: Property details (or None if not found) in the same order as mls_ids
+    """
+    async with AsyncSimplyRetsAPI(username=username, password=password) as client:
+        return await client.get_properties_bulk(mls_ids)
+
+
+def extract_property_data(properties: Iterable[Dict]) -> List[Dict]:
     """
     Extract relevant data from properties for analysis
     
     Args:
-        properties (list): List of property objects from the API
+        properties (iterable): Property objects from the API, e.g. a streamed page
         
     Returns:
         list: List of simplified property data for analysis
@@ -147,55 +396,68 @@ def extract_property_data(properties: List[Dict]) -> List[Dict]:
     
     for prop in properties:
         try:
+            # Bind the nested dicts once instead of walking them for every field
+            details = prop.get("property") or {}
+            address = prop.get("address") or {}
+            geo = prop.get("geo") or {}
+            
             # Calculate price per square foot
-            square_feet = prop.get("property", {}).get("area", 0) or 0
-            list_price = prop.get("listPrice", 0) or 0
+            square_feet = details.get("area") or 0
+            list_price = prop.get("listPrice") or 0
             price_per_sqft = None
             if square_feet > 0 and list_price > 0:
                 price_per_sqft = round(list_price / square_feet, 2)
             
-            # Calculate price drop percentage
-            original_price = prop.get("originalListPrice", 0) or 0
+            # Calculate price drop and price drop percentage
+            original_price = prop.get("originalListPrice") or 0
+            price_drop = original_price - list_price if original_price and list_price else 0
             price_drop_percent = None
             if original_price > 0 and list_price > 0 and original_price > list_price:
-                price_drop_percent = round(((original_price - list_price) / original_price) * 100, 2)
+                price_drop_percent = round((price_drop / original_price) * 100, 2)
             
-            # Get location data
-            lat = prop.get("geo", {}).get("lat")
-            lng = prop.get("geo", {}).get("lng")
+            # Lowercase each features string once and run every membership test against it
+            interior_features = details.get("interiorFeatures") or ""
+            exterior_features = details.get("exteriorFeatures") or ""
+            interior_lower = interior_features.lower()
+            exterior_lower = exterior_features.lower()
+            
+            # Only truncate (and mark with an ellipsis) remarks that are actually too long
+            remarks = prop.get("remarks") or ""
+            if len(remarks) > 200:
+                remarks = remarks[:200] + "..."
             
             # Extract key property information
             property_info = {
                 "mlsId": prop.get("mlsId"),
                 "listingId": prop.get("listingId", ""),
-                "address": prop.get('address', {}).get('full', 'N/A'),
-                "city": prop.get('address', {}).get('city', ''),
-                "state": prop.get('address', {}).get('state', ''),
-                "zip": prop.get('address', {}).get('postalCode', ''),
-                "county": prop.get('address', {}).get('country', ''),
+                "address": address.get("full", "N/A"),
+                "city": address.get("city", ""),
+                "state": address.get("state", ""),
+                "zip": address.get("postalCode", ""),
+                "county": address.get("country", ""),
                 "price": prop.get("listPrice"),
                 "originalPrice": prop.get("originalListPrice"),
-                "bedrooms": prop.get("property", {}).get("bedrooms"),
-                "bathrooms": (prop.get("property", {}).get("bathsFull", 0) or 0) + 
-                             ((prop.get("property", {}).get("bathsHalf", 0) or 0) * 0.5),
+                "bedrooms": details.get("bedrooms"),
+                "bathrooms": (details.get("bathsFull") or 0) + ((details.get("bathsHalf") or 0) * 0.5),
                 "squareFeet": square_feet,
                 "pricePerSqFt": price_per_sqft,
-                "yearBuilt": prop.get("property", {}).get("yearBuilt"),
-                "propertyType": prop.get("property", {}).get("type"),
-                "propertySubType": prop.get("property", {}).get("subType"),
-                "lotSize": prop.get("property", {}).get("lotSize"),
-                "stories": prop.get("property", {}).get("stories"),
-                "garageSpaces": prop.get("property", {}).get("garageSpaces"),
-                "hasPool": "pool" in (prop.get("property", {}).get("exteriorFeatures", "").lower() or ""),
-                "remarks": prop.get("remarks", "")[:200] + "..." if prop.get("remarks") else "",
-                "photos": len(prop.get("photos", [])),
-                "priceDrop": (prop.get("originalListPrice", 0) - prop.get("listPrice", 0)) 
-                             if prop.get("originalListPrice") and prop.get("listPrice") else 0,
+                "yearBuilt": details.get("yearBuilt"),
+                "propertyType": details.get("type"),
+                "propertySubType": details.get("subType"),
+                "lotSize": details.get("lotSize"),
+                "stories": details.get("stories"),
+                "garageSpaces": details.get("garageSpaces"),
+                "hasPool": "pool" in exterior_lower,
+                "hasFireplace": "fireplace" in interior_lower,
+                "hasView": "view" in exterior_lower,
+                "remarks": remarks,
+                "photos": len(prop.get("photos") or []),
+                "priceDrop": price_drop,
                 "priceDropPercent": price_drop_percent,
-                "interiorFeatures": prop.get("property", {}).get("interiorFeatures", ""),
-                "exteriorFeatures": prop.get("property", {}).get("exteriorFeatures", ""),
-                "latitude": lat,
-                "longitude": lng
+                "interiorFeatures": interior_features,
+                "exteriorFeatures": exterior_features,
+                "latitude": geo.get("lat"),
+                "longitude": geo.get("lng")
             }
             
             simplified_properties.append(property_info)
@@ -206,149 +468,301 @@ def extract_property_data(properties: List[Dict]) -> List[Dict]:
     return simplified_properties
 
 
-def analyze_properties_with_huggingface(properties: List[Dict], api_key: str) -> Dict:
+# Static sections of the analysis prompt, built once at import time
+_PROMPT_INTRO = (
+    "You are a real estate analysis expert. Analyze the following properties and identify "
+    "the most interesting ones for a real estate agent to look at. \n\n"
+    "Here are statistics for the entire portfolio of "
+)
+_PROMPT_FOCUS = (
+    "\n\nFocus on:\n"
+    "1. Properties with high value relative to their price (good deals)\n"
+    "2. Properties with unique or special features\n"
+    "3. Properties that have had significant price drops\n"
+    "4. Properties in desirable neighborhoods\n"
+    "5. Any anomalies or special opportunities in the market\n\n"
+    "Sample of properties (10 out of "
+)
+_PROMPT_INSTRUCTIONS = (
+    "\n\nProvide a detailed analysis with specific properties that stand out and explain why "
+    "they're worth looking at. Include the MLS ID and address of each property you highlight.\n"
+    "Your analysis should be practical and actionable for a real estate professional. "
+    "Highlight at least 3-5 specific properties and explain their unique value propositions.\n\n"
+    "Analysis:"
+)
+
+
+def compute_property_stats(properties: List[Dict]) -> Dict:
     """
-    Use Hugging Face model to analyze properties and find interesting ones
+    Compute summary price statistics for a set of properties
     
     Args:
         properties (list): List of simplified property data
-        api_key (str): Hugging Face API key
         
     Returns:
-        dict: Analysis results with interesting properties
+        dict: Count, min/max/average price and average price per square foot when available
     """
-    # Create a detailed property summary for the top 10 properties (to keep prompt size manageable)
-    property_sample = properties[:10]
-    property_summary = json.dumps(property_sample, indent=2)
+    # Single pass over the full set
+    price_count = 0
+    price_sum = 0.0
+    min_price = float('inf')
+    max_price = 0
+    sqft_price_count = 0
+    sqft_price_sum = 0.0
+    for p in properties:
+        price = p.get("price")
+        if price is not None:
+            price_count += 1
+            price_sum += price
+            if price < min_price:
+                min_price = price
+            if price > max_price:
+                max_price = price
+        price_per_sqft = p.get("pricePerSqFt")
+        if price_per_sqft is not None:
+            sqft_price_count += 1
+            sqft_price_sum += price_per_sqft
     
-    # Create statistics about the full set
     price_stats = {
         "count": len(properties),
-        "min_price": min([p.get("price", 0) for p in properties if p.get("price") is not None], default=0),
-        "max_price": max([p.get("price", 0) for p in properties if p.get("price") is not None], default=0),
-        "avg_price": sum([p.get("price", 0) or 0 for p in properties if p.get("price") is not None]) / 
-                    len([p for p in properties if p.get("price") is not None]) if properties else 0
+        "min_price": min_price if price_count else 0,
+        "max_price": max_price if price_count else 0,
+        "avg_price": price_sum / price_count if price_count else 0
     }
     
     # Add average price per square foot if available
-    properties_with_sqft = [p for p in properties if p.get("pricePerSqFt") is not None]
-    if properties_with_sqft:
-        price_stats["avg_price_per_sqft"] = sum([p.get("pricePerSqFt", 0) or 0 for p in properties_with_sqft]) / len(properties_with_sqft)
+    if sqft_price_count:
+        price_stats["avg_price_per_sqft"] = sqft_price_sum / sqft_price_count
+    
+    return price_stats
+
+
+def _build_analysis_prompt(properties: List[Dict], price_stats: Dict) -> str:
+    """
+    Build the analysis prompt for a set of properties
+    
+    This is where all JSON serialization happens, so it should only run
+    when the prompt is actually needed.
+    
+    Args:
+        properties (list): List of simplified property data
+        price_stats (dict): Statistics from compute_property_stats
+        
+    Returns:
+        str: Prompt text for the model
+    """
+    # Create a detailed property summary for the top 10 properties (to keep prompt size manageable)
+    property_sample = properties[:10]
+    property_summary = _json_dumps(property_sample)
     
     # Find properties with significant price drops
     price_drops = [p for p in properties if p.get("priceDropPercent") is not None and p.get("priceDropPercent") > 3]
-    price_drops.sort(key=lambda p: p.get("priceDropPercent", 0) or 0, reverse=True)
-    price_drop_summary = json.dumps(price_drops[:5], indent=2) if price_drops else "No significant price drops"
+    top_price_drops = heapq.nlargest(5, price_drops, key=lambda p: p.get("priceDropPercent", 0) or 0)
+    price_drop_summary = _json_dumps(top_price_drops) if top_price_drops else "No significant price drops"
     
     # Find properties with good value (price per square foot below average)
-    good_value = []
+    top_good_value = []
     if "avg_price_per_sqft" in price_stats:
         good_value = [p for p in properties if p.get("pricePerSqFt") is not None and 
                     p.get("pricePerSqFt") < price_stats["avg_price_per_sqft"] * 0.9]
-        good_value.sort(key=lambda p: p.get("pricePerSqFt") or float('inf'))
-    value_summary = json.dumps(good_value[:5], indent=2) if good_value else "No standout value properties"
+        top_good_value = heapq.nsmallest(5, good_value, key=lambda p: p.get("pricePerSqFt") or float('inf'))
+    value_summary = _json_dumps(top_good_value) if top_good_value else "No standout value properties"
     
     # Find properties with unique features
     unique_features = [p for p in properties if 
-                      p.get("hasPool") or 
-                      "fireplace" in (p.get("interiorFeatures", "").lower() or "") or
-                      "view" in (p.get("exteriorFeatures", "").lower() or "")]
-    features_summary = json.dumps(unique_features[:5], indent=2) if unique_features else "No properties with standout features"
+                      p.get("hasPool") or p.get("hasFireplace") or p.get("hasView")]
+    features_summary = _json_dumps(unique_features[:5]) if unique_features else "No properties with standout features"
     
     # Create a prompt for the AI model
-    prompt = f"""You are a real estate analysis expert. Analyze the following properties and identify the most interesting ones for a real estate agent to look at. 
+    property_count = str(len(properties))
+    prompt = ''.join([
+        _PROMPT_INTRO, property_count, " properties:\n",
+        _json_dumps(price_stats),
+        _PROMPT_FOCUS, property_count, "):\n",
+        property_summary,
+        "\n\nProperties with significant price drops:\n",
+        price_drop_summary,
+        "\n\nProperties with good value (below average price per square foot):\n",
+        value_summary,
+        "\n\nProperties with unique features:\n",
+        features_summary,
+        _PROMPT_INSTRUCTIONS
+    ])
+    
+    return prompt
 
-Here are statistics for the entire portfolio of {len(properties)} properties:
-{json.dumps(price_stats, indent=2)}
 
-Focus on:
-1. Properties with high value relative to their price (good deals)
-2. Properties with unique or special features
-3. Properties that have had significant price drops
-4. Properties in desirable neighborhoods
-5. Any anomalies or special opportunities in the market
+def _extract_generated_text(result: Any) -> str:
+    """Pull the generated text out of one Hugging Face text-generation result"""
+    if isinstance(result, list):
+        result = result[0] if result else {}
+    if isinstance(result, dict):
+        return result.get('generated_text', '')
+    return str(result)
 
-Sample of properties (10 out of {len(properties)}):
-{property_summary}
 
-Properties with significant price drops:
-{price_drop_summary}
+def _get_hf_cache() -> diskcache.Cache:
+    """Open the analysis cache the first time it is needed, so other runs leave no cache directory behind"""
+    global _hf_cache
+    if _hf_cache is None:
+        _hf_cache = diskcache.Cache(HF_CACHE_DIR)
+    return _hf_cache
 
-Properties with good value (below average price per square foot):
-{value_summary}
 
-Properties with unique features:
-{features_summary}
+def _prompt_cache_key(prompt: str) -> str:
+    """Derive a deterministic cache key for a prompt"""
+    return hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
 
-Provide a detailed analysis with specific properties that stand out and explain why they're worth looking at. Include the MLS ID and address of each property you highlight.
-Your analysis should be practical and actionable for a real estate professional. Highlight at least 3-5 specific properties and explain their unique value propositions.
 
-Analysis:"""
+def _analysis_result(analysis: str, properties: List[Dict], price_stats: Dict) -> Dict:
+    """Wrap generated analysis text in the result structure returned to callers"""
+    return {
+        "status": "success",
+        "analysis": analysis,
+        "timestamp": int(time.time()),
+        "property_count": len(properties),
+        "stats": price_stats
+    }
+
+
+def _request_error(reason: str, properties: List[Dict]) -> Dict:
+    """Build the result returned for a property set the model produced no analysis for"""
+    return {
+        "status": "error",
+        "message": f"Error analyzing properties. {reason}",
+        "raw_properties": properties[:5]  # Include sample properties in case of error
+    }
+
+
+def analyze_properties_batch(property_sets: List[List[Dict]], api_key: str, use_cache: bool = True) -> List[Dict]:
+    """
+    Analyze several sets of properties with a single Hugging Face inference request
+    
+    Args:
+        property_sets (list): Lists of simplified property data, e.g. one per search
+        api_key (str): Hugging Face API key
+        use_cache (bool): Reuse and store analyses in the local cache, keyed on the prompt
+        
+    Returns:
+        list: Analysis results for each property set, in the same order
+    """
+    stats = [compute_property_stats(properties) for properties in property_sets]
+    
+    # Without a key the request cannot succeed, so skip building the prompts at all
+    if not api_key:
+        logger.error("Hugging Face API key is required for analysis.")
+        return [
+            {
+                "status": "error",
+                "message": "Error analyzing properties: Hugging Face API key is required",
+                "property_count": len(properties),
+                "stats": price_stats
+            }
+            for properties, price_stats in zip(property_sets, stats)
+        ]
+    
+    all_prompts = [
+        _build_analysis_prompt(properties, price_stats)
+        for properties, price_stats in zip(property_sets, stats)
+    ]
+    results = [None] * len(all_prompts)
+    
+    # Serve unchanged prompts from the cache and only send the rest to the model
+    pending = []
+    for i, prompt in enumerate(all_prompts):
+        analysis = _get_hf_cache().get(_prompt_cache_key(prompt)) if use_cache else None
+        if analysis is not None:
+            logger.info("Using cached Hugging Face analysis")
+            results[i] = _analysis_result(analysis, property_sets[i], stats[i])
+        else:
+            pending.append(i)
+    
+    if not pending:
+        return results
+    
+    prompts = [all_prompts[i] for i in pending]
 
     # Attempt to generate analysis
     try:
-        logger.info("Requesting analysis from Hugging Face API")
-        response = requests.post(
-            'https://api-inference.huggingface.co/models/mistralai/Mistral-7B-Instruct-v0.2',
+        logger.info(f"Requesting analysis of {len(prompts)} property set(s) from Hugging Face API")
+        response = HF_SESSION.post(
+            HF_MODEL_URL,
             headers={
                 'Authorization': f'Bearer {api_key}',
                 'Content-Type': 'application/json',
             },
-            json={
-                'inputs': prompt,
-                'parameters': {
-                    'max_new_tokens': 1000,
-                    'min_new_tokens': 100,
-                    'temperature': 0.7,
-                    'top_p': 0.9,
-                    'repetition_penalty': 1.1
-                }
-            }
+            data=orjson.dumps({
+                # A lone prompt is sent as a plain string, several as a list
+                'inputs': prompts[0] if len(prompts) == 1 else prompts,
+                'parameters': HF_GENERATION_PARAMETERS
+            }),
+            timeout=HF_TIMEOUT
         )
         
         logger.info(f"Hugging Face Response Status: {response.status_code}")
         
         if response.status_code != 200:
             logger.error(f"Hugging Face API Error: {response.text}")
-            return {
-                "status": "error",
-                "message": f"Error analyzing properties. Status code: {response.status_code}",
-                "raw_properties": properties[:5]  # Include sample properties in case of error
-            }
+            for i in pending:
+                results[i] = _request_error(f"Status code: {response.status_code}", property_sets[i])
+            return results
 
-        result = response.json()
+        result = _json_loads(response)
         logger.info("Successfully received analysis from Hugging Face")
         
-        if isinstance(result, list):
-            generated_text = result[0].get('generated_text', '')
-        elif isinstance(result, dict):
-            generated_text = result.get('generated_text', '')
-        else:
-            generated_text = str(result)
-        
-        # Extract just the analysis part (remove the prompt)
-        analysis = generated_text.replace(prompt, '').strip()
-        
-        if not analysis:
-            logger.warning("Empty analysis generated. Using fallback.")
-            analysis = "Unable to generate property analysis. Please check the property data and try again."
+        # A batched request returns one result per prompt; anything else (e.g. an error
+        # object) leaves the affected sets without a result, so they are reported as errors
+        generated = [result] if len(prompts) == 1 else result
+        if not isinstance(generated, list) or len(generated) != len(prompts):
+            logger.error(f"Expected {len(prompts)} results from Hugging Face, got: {response.text}")
+            generated = generated[:len(prompts)] if isinstance(generated, list) else []
+        for i in pending[len(generated):]:
+            results[i] = _request_error("The model returned no result for this property set", property_sets[i])
         
-        return {
-            "status": "success",
-            "analysis": analysis,
-            "timestamp": int(time.time()),
-            "property_count": len(properties),
-            "stats": price_stats
-        }
+        for i, item in zip(pending, generated):
+            prompt = all_prompts[i]
+            generated_text = _extract_generated_text(item)
+            
+            # Extract just the analysis part; the model echoes the prompt at the start
+            if generated_text.startswith(prompt):
+                analysis = generated_text[len(prompt):].strip()
+            else:
+                analysis = generated_text.strip()
+            
+            if not analysis:
+                logger.warning("Empty analysis generated. Using fallback.")
+                analysis = "Unable to generate property analysis. Please check the property data and try again."
+            elif use_cache:
+                _get_hf_cache().set(_prompt_cache_key(prompt), analysis, expire=HF_CACHE_EXPIRE)
+            
+            results[i] = _analysis_result(analysis, property_sets[i], stats[i])
+        return results
 
     except Exception as e:
         logger.error(f"Error generating analysis: {str(e)}")
-        return {
-            "status": "error",
-            "message": f"Error analyzing properties: {str(e)}",
-            "property_count": len(properties),
-            "stats": price_stats
-        }
+        for i in pending:
+            results[i] = {
+                "status": "error",
+                "message": f"Error analyzing properties: {str(e)}",
+                "property_count": len(property_sets[i]),
+                "stats": stats[i]
+            }
+        return results
+
+
+def analyze_properties_with_huggingface(properties: List[Dict], api_key: str, use_cache: bool = True) -> Dict:
+    """
+    Use Hugging Face model to analyze properties and find interesting ones
+    
+    Args:
+        properties (list): List of simplified property data
+        api_key (str): Hugging Face API key
+        use_cache (bool): Reuse and store the analysis in the local cache, keyed on the prompt
+        
+    Returns:
+        dict: Analysis results with interesting properties
+    """
+    return analyze_properties_batch([properties], api_key, use_cache=use_cache)[0]
 
 
 def display_metadata(metadata):
@@ -420,6 +834,25 @@ def display_metadata(metadata):
     print("Example: --city \"Houston\" --type \"Residential\"")
 
 
+def display_property(property_data):
+    """
+    Display the key details of a single property
+    
+    Args:
+        property_data (dict): Property object from the API
+    """
+    details = property_data.get('property') or {}
+    address = property_data.get('address') or {}
+    
+    print("\nProperty Details:")
+    print(f"Address: {address.get('full', 'N/A')}")
+    print(f"City: {address.get('city', 'N/A')}")
+    print(f"Price: ${property_data.get('listPrice') or 0:,.0f}")
+    print(f"Bedrooms: {details.get('bedrooms', 'N/A')}")
+    print(f"Bathrooms: {(details.get('bathsFull') or 0) + ((details.get('bathsHalf') or 0) * 0.5)}")
+    print(f"Square Feet: {details.get('area', 'N/A')}")
+
+
 def main():
     """Main function to run the script locally"""
     print("\nSimplyRETS Real Estate Analysis Tool with Hugging Face")
@@ -441,7 +874,7 @@ def main():
     parser.add_argument('--type', type=str, help='Property type (e.g. "residential", "rental", "multifamily", "commercial")')
     parser.add_argument('--status', type=str, help='Property status (e.g. "Active", "Pending", "Sold")')
     parser.add_argument('--limit', type=int, default=25, help='Maximum number of properties to retrieve')
-    parser.add_argument('--mls', type=str, help='Fetch a specific property by MLS ID')
+    parser.add_argument('--mls', type=str, action='append', help='Fetch a specific property by MLS ID (repeat to fetch several concurrently)')
     parser.add_argument('--metadata', action='store_true', help='Fetch and display property feed metadata')
     parser.add_argument('--vendor', type=str, help='Vendor parameter for metadata (for multiple feeds)')
     parser.add_argument('--output', type=str, default='property_analysis.json', help='Output file for analysis results')
@@ -449,6 +882,8 @@ def main():
     parser.add_argument('--password', type=str, help='SimplyRETS API password (default: from environment or "simplyrets")')
     parser.add_argument('--apikey', type=str, help='Hugging Face API key (REQUIRED)')
     parser.add_argument('--skip-ai', action='store_true', help='Skip AI analysis and just collect property data')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk SimplyRETS response cache')
+    parser.add_argument('--no-llm-cache', action='store_true', help='Bypass the local cache of Hugging Face analyses')
     args = parser.parse_args()
     
     # Get API credentials (using demo credentials by default if not provided)
@@ -477,147 +912,182 @@ def main():
         logger.info(f"Initializing SimplyRETS API client with provided credentials")
         simplyrets_client = SimplyRetsAPI(
             username=simplyrets_username,
-            password=simplyrets_password
+            password=simplyrets_password,
+            use_cache=not args.no_cache
         )
         
-        # Check if we should fetch metadata
-        if args.metadata:
-            print("\nFetching property feed metadata...")
-            metadata = simplyrets_client.get_properties_metadata(vendor=args.vendor)
+        only_metadata = (args.metadata and args.mls is None and args.q is None and
+                         args.city is None and args.state is None and args.county is None)
+        
+        # Metadata, MLS lookups and the search are independent requests, so issue them concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            metadata_future = None
+            if args.metadata:
+                print("\nFetching property feed metadata...")
+                metadata_future = executor.submit(simplyrets_client.get_properties_metadata, vendor=args.vendor)
+            
+            mls_future = None
+            if args.mls:
+                if len(args.mls) == 1:
+                    print(f"\nFetching property with MLS ID: {args.mls[0]}")
+                    mls_future = executor.submit(simplyrets_client.get_property_by_id, args.mls[0])
+                else:
+                    print(f"\nFetching {len(args.mls)} properties with MLS IDs: {', '.join(args.mls)}")
+                    mls_future = executor.submit(asyncio.run, fetch_properties_bulk(
+                        args.mls,
+                        username=simplyrets_username,
+                        password=simplyrets_password
+                    ))
             
-            if metadata:
-                display_metadata(metadata)
+            futures = []
+            if not args.mls and not only_metadata:
+                # Build search parameters for property search
+                search_params = {"limit": args.limit}
                 
-                # Save metadata to file
-                with open("property_metadata.json", 'w') as f:
-                    json.dump(metadata, f, indent=2)
-                print(f"\nMetadata saved to property_metadata.json")
-            else:
-                print("Failed to retrieve metadata or no metadata available")
+                if args.q:
+                    search_params["q"] = args.q
+                if args.city:
+                    search_params["cities"] = args.city
+                if args.state:
+                    search_params["states"] = args.state
+                if args.county:
+                    search_params["counties"] = args.county
+                if args.minprice:
+                    search_params["minprice"] = args.minprice
+                if args.maxprice:
+                    search_params["maxprice"] = args.maxprice
+                if args.minbeds:
+                    search_params["minbeds"] = args.minbeds
+                if args.minbaths:
+                    search_params["minbaths"] = args.minbaths
+                if args.type:
+                    search_params["type"] = args.type
+                if args.status:
+                    search_params["status"] = args.status
                 
-            # Return if only metadata was requested
-            if args.mls is None and args.q is None and args.city is None and args.state is None and args.county is None:
-                return
-        
-        # Check if we're fetching a specific property by MLS ID
-        if args.mls:
-            print(f"\nFetching property with MLS ID: {args.mls}")
-            property_data = simplyrets_client.get_property_by_id(args.mls)
-            
-            if property_data:
-                print("\nProperty Details:")
-                print(f"Address: {property_data.get('address', {}).get('full', 'N/A')}")
-                print(f"City: {property_data.get('address', {}).get('city', 'N/A')}")
-                print(f"Price: ${property_data.get('listPrice', 0):,.0f}")
-                print(f"Bedrooms: {property_data.get('property', {}).get('bedrooms', 'N/A')}")
-                print(f"Bathrooms: {property_data.get('property', {}).get('bathsFull', 0) + (property_data.get('property', {}).get('bathsHalf', 0) * 0.5)}")
-                print(f"Square Feet: {property_data.get('property', {}).get('area', 'N/A')}")
+                # Default to a simple query if nothing specific provided
+                if (not args.q and not args.city and not args.state and 
+                    not args.county and not args.minprice and not args.maxprice and 
+                    not args.minbeds and not args.minbaths and not args.type and 
+                    not args.status):
+                    # Just leave default parameters - get any available properties up to the limit
+                    pass
+                
+                # Fetch properties
+                logger.info(f"Fetching properties with parameters: {search_params}")
+                print(f"\nSearching for properties with parameters: {search_params}")
+                # Parse and simplify each streamed page in the background while the next page is fetched
+                futures = [
+                    executor.submit(extract_property_data, page)
+                    for page in simplyrets_client.iter_properties(search_params)
+                ]
+            
+            # Check if we should display metadata
+            if metadata_future:
+                metadata = metadata_future.result()
+                
+                if metadata:
+                    display_metadata(metadata)
+                    
+                    # Save metadata to file
+                    _write_json("property_metadata.json", metadata)
+                    print(f"\nMetadata saved to property_metadata.json")
+                else:
+                    print("Failed to retrieve metadata or no metadata available")
+                    
+                # Return if only metadata was requested
+                if only_metadata:
+                    return
+            
+            # Check if we're fetching specific properties by MLS ID
+            if mls_future:
+                results = mls_future.result()
+                if len(args.mls) == 1:
+                    results = [results]
                 
-                # Save property data to file
-                with open(f"property_{args.mls}.json", 'w') as f:
-                    json.dump(property_data, f, indent=2)
-                print(f"\nFull property details saved to property_{args.mls}.json")
+                for mls_id, property_data in zip(args.mls, results):
+                    if property_data:
+                        display_property(property_data)
+                        
+                        # Save property data to file
+                        _write_json(f"property_{mls_id}.json", property_data)
+                        print(f"\nFull property details saved to property_{mls_id}.json")
+                    else:
+                        print(f"Property with MLS ID {mls_id} not found.")
                 return
-            else:
-                print(f"Property with MLS ID {args.mls} not found.")
+            
+            # Collect in submission order so the API sort order is preserved
+            processed_properties = list(chain.from_iterable(f.result() for f in futures))
+            property_count = len(processed_properties)
+            
+            if not property_count:
+                logger.warning("No properties found with given search parameters")
+                print("\nNo properties found with your search criteria.")
+                print("Try running with --metadata to see available cities, property types, etc.")
                 return
-        
-        # Build search parameters for property search
-        search_params = {"limit": args.limit}
-        
-        if args.q:
-            search_params["q"] = args.q
-        if args.city:
-            search_params["cities"] = args.city
-        if args.state:
-            search_params["states"] = args.state
-        if args.county:
-            search_params["counties"] = args.county
-        if args.minprice:
-            search_params["minprice"] = args.minprice
-        if args.maxprice:
-            search_params["maxprice"] = args.maxprice
-        if args.minbeds:
-            search_params["minbeds"] = args.minbeds
-        if args.minbaths:
-            search_params["minbaths"] = args.minbaths
-        if args.type:
-            search_params["type"] = args.type
-        if args.status:
-            search_params["status"] = args.status
-        
-        # Default to a simple query if nothing specific provided
-        if (not args.q and not args.city and not args.state and 
-            not args.county and not args.minprice and not args.maxprice and 
-            not args.minbeds and not args.minbaths and not args.type and 
-            not args.status):
-            # Just leave default parameters - get any available properties up to the limit
-            pass
-        
-        # Fetch properties
-        logger.info(f"Fetching properties with parameters: {search_params}")
-        print(f"\nSearching for properties with parameters: {search_params}")
-        properties = simplyrets_client.get_properties(search_params)
-        
-        if not properties:
-            logger.warning("No properties found with given search parameters")
-            print("\nNo properties found with your search criteria.")
-            print("Try running with --metadata to see available cities, property types, etc.")
-            return
-        
-        logger.info(f"Processing {len(properties)} properties for analysis")
-        processed_properties = extract_property_data(properties)
+            
+            logger.info(f"Processed {property_count} properties for analysis")
         
         # Calculate basic statistics
         try:
-            properties_with_price = [p for p in processed_properties if p.get("price") is not None]
-            avg_price = sum(p.get("price", 0) or 0 for p in properties_with_price) / len(properties_with_price) if properties_with_price else 0
-            
-            properties_with_sqft = [p for p in processed_properties if p.get("squareFeet")]
-            avg_sqft = sum(p.get("squareFeet", 0) or 0 for p in properties_with_sqft) / len(properties_with_sqft) if properties_with_sqft else 0
+            price_count = 0
+            price_sum = 0
+            min_price = float('inf')
+            max_price = 0
+            sqft_count = 0
+            sqft_sum = 0
+            for p in processed_properties:
+                price = p.get("price")
+                if price is not None:
+                    price_count += 1
+                    price_sum += price
+                    if price < min_price:
+                        min_price = price
+                    if price > max_price:
+                        max_price = price
+                square_feet = p.get("squareFeet")
+                if square_feet:
+                    sqft_count += 1
+                    sqft_sum += square_feet
             
-            # Get additional stats
-            min_price = min((p.get("price") for p in properties_with_price), default=0)
-            max_price = max((p.get("price") for p in properties_with_price), default=0)
+            avg_price = price_sum / price_count if price_count else 0
+            avg_sqft = sqft_sum / sqft_count if sqft_count else 0
+            if not price_count:
+                min_price = 0
             
             # Find properties with price drops
             price_drops = [p for p in processed_properties if p.get("priceDropPercent") is not None and p.get("priceDropPercent") > 0]
-            price_drops.sort(key=lambda p: p.get("priceDropPercent", 0) or 0, reverse=True)
+            top_price_drops = heapq.nlargest(3, price_drops, key=lambda p: p.get("priceDropPercent", 0) or 0)
         except Exception as e:
             logger.error(f"Error calculating statistics: {str(e)}")
             avg_price = 0
             avg_sqft = 0
             min_price = 0
             max_price = 0
-            price_drops = []
+            top_price_drops = []
         
         # Print summary information
-        print(f"\nRetrieved {len(properties)} properties")
+        print(f"\nRetrieved {property_count} properties")
         print(f"Price Range: ${min_price:,.0f} to ${max_price:,.0f}")
         print(f"Average Price: ${avg_price:,.2f}")
         print(f"Average Square Footage: {avg_sqft:,.0f} sq ft")
         
         # Show locations found
-        cities = {}
-        for prop in processed_properties:
-            city = prop.get('city', 'Unknown')
-            if city:
-                cities[city] = cities.get(city, 0) + 1
+        cities = Counter(prop.get('city') for prop in processed_properties if prop.get('city'))
         
         if cities:
             print("\nProperties by location:")
-            for city, count in cities.items():
+            for city, count in cities.most_common():
                 print(f"  {city}: {count} properties")
         
-        if price_drops:
+        if top_price_drops:
             print(f"\nTop Price Drops:")
-            for i, prop in enumerate(price_drops[:3], 1):
+            for i, prop in enumerate(top_price_drops, 1):
                 print(f"  {i}. {prop.get('address')} - ${prop.get('price'):,.0f} (↓{prop.get('priceDropPercent')}%)")
         
         # Save processed data to file
         props_file = f"properties_data.json"
-        with open(props_file, 'w') as f:
-            json.dump(processed_properties, f, indent=2)
+        _write_json(props_file, processed_properties)
         print(f"\nProperty data saved to {props_file}")
         
         # Skip analysis if requested
@@ -629,12 +1099,15 @@ def main():
         # Perform analysis with Hugging Face
         logger.info("Analyzing properties with Hugging Face model")
         print("\nAnalyzing properties with Hugging Face model...")
-        analysis_result = analyze_properties_with_huggingface(processed_properties, huggingface_key)
+        analysis_result = analyze_properties_with_huggingface(
+            processed_properties,
+            huggingface_key,
+            use_cache=not args.no_llm_cache
+        )
         
         # Save results to file
         output_file = args.output
-        with open(output_file, 'w') as f:
-            json.dump(analysis_result, f, indent=2)
+        _write_json(output_file, analysis_result)
         
         logger.info(f"Analysis complete. Results saved to {output_file}")
         
@@ -1,18 +1,164 @@
 import time
 import random
-import pandas as pd
+import os
+import asyncio
+import csv
+import argparse
+import multiprocessing
+import sqlite3
+from functools import partial
+import orjson
 import re
+import soupsieve
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36'
+
+# Patterns used when parsing result pages, compiled once
+_DETAILS_RE = re.compile(
+    r"(?P<beds>\d+)\s*bd|(?P<baths>\d+(?:\.\d+)?)\s*ba|(?P<sqft>[\d,]+)\s*sqft"
+)
+_NEXT_DATA_RE = re.compile(r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
+# Both card layouts in one traversal; property-card divs inside a photo-cards item are skipped
+# so a card isn't picked up twice
+_CARDS_SELECTOR = "ul.photo-cards > li, div[data-test='property-card']:not(ul.photo-cards > li *)"
+_FSBO_BADGE_SELECTOR = ".StyledZillowLogo-c11n-8-84-3__sc-1ly7na1-0"
+
+# Listing card selectors, compiled once instead of being re-parsed on every card
+_SEL_CARDS = soupsieve.compile(_CARDS_SELECTOR)
+_SEL_FSBO_BADGE = soupsieve.compile(_FSBO_BADGE_SELECTOR)
+_SEL_ADDRESS = soupsieve.compile("address")
+_SEL_PRICE = soupsieve.compile("[data-test='property-card-price']")
+_SEL_DETAILS = soupsieve.compile("[data-test='property-card-details']")
+_SEL_LINK = soupsieve.compile("a[href^='/homedetails']")
+
+# Pulls the raw fields out of every listing card in the page, so Selenium can skip shipping and parsing the HTML
+_EXTRACT_CARDS_JS = """
+const text = (card, selector) => {
+    const elem = card.querySelector(selector);
+    return elem ? elem.textContent.trim() : null;
+};
+return Array.from(document.querySelectorAll(arguments[0]), card => {
+    const link = card.querySelector("a[href^='/homedetails']");
+    return {
+        address: text(card, 'address'),
+        price: text(card, "[data-test='property-card-price']"),
+        details: text(card, "[data-test='property-card-details']"),
+        url: link ? link.href : null,
+        fsbo: card.querySelector(arguments[1]) !== null
+            || card.textContent.toLowerCase().includes('for sale by owner')
+    };
+});
+"""
+
+# Link of the first listing card, used to tell when the next results page has rendered
+_FIRST_CARD_HREF_JS = """
+const link = document.querySelector("a[href^='/homedetails'], a[href*='zillow.com/homedetails']");
+return link ? link.href : null;
+"""
+
+# Resources the scraper never reads; blocked in Chrome to save bandwidth and render time
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg",
+    "*.css", "*.woff", "*.woff2", "*.ttf",
+    "*/analytics/*", "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*"
+]
+
+# Fixed schema for collected listings; each listing is stored as a tuple in this column order
+LISTING_COLUMNS = ('address', 'price', 'beds', 'baths', 'sqft', 'url', 'source')
+
+def parse_details(details_text, listing):
+    """Fill in beds, baths and sqft on a listing dict from a card's details text."""
+    # One scan for all three fields, keeping the first match of each
+    for match in _DETAILS_RE.finditer(details_text):
+        field = match.lastgroup
+        if field not in listing:
+            value = match.group(field)
+            listing[field] = value.replace(',', '') if field == 'sqft' else value
+
+def fsbo_search_url(location, page=1):
+    """Build the Zillow FSBO search URL for a location and results page."""
+    url = f"https://www.zillow.com/homes/for_sale/{location.replace(' ', '-')}/0_fs/"
+    # Pages after the first are addressed by a path segment instead of a click
+    return url if page == 1 else f"{url}{page}_p/"
+
+# Close buttons for the various popups Zillow shows; this varies based on Zillow's current design
+POPUP_SELECTORS = (
+    "button[aria-label='Close']",
+    ".modal-dialog .close",
+    "#sgpd-closeButton",
+    "button.popup-close"
+)
+
+# Clicks every visible close button matching the given selectors and returns how many it clicked
+_CLOSE_POPUPS_JS = """
+let closed = 0;
+for (const button of document.querySelectorAll(arguments[0].join(','))) {
+    if (button.offsetParent !== null) {
+        button.click();
+        closed++;
+    }
+}
+return closed;
+"""
+
+class PageCache:
+    """On-disk cache of parsed result pages, keyed by URL and validated with ETag/Last-Modified."""
+    
+    def __init__(self, path='zillow_page_cache.sqlite', expire_after=3600):
+        """Open (or create) the cache database."""
+        self.expire_after = expire_after
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, listings BLOB, fetched_at REAL)"
+        )
+        
+    def get(self, url):
+        """Return the cached entry for a URL as a dict, or None."""
+        row = self.conn.execute(
+            "SELECT etag, last_modified, listings, fetched_at FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, listings, fetched_at = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'listings': [tuple(listing) for listing in orjson.loads(listings)],
+            'fresh': time.time() - fetched_at < self.expire_after
+        }
+        
+    def store(self, url, etag, last_modified, listings):
+        """Save the parsed listings for a URL along with its validators."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+            (url, etag, last_modified, orjson.dumps(listings), time.time())
+        )
+        self.conn.commit()
+        
+    def touch(self, url):
+        """Mark a cached page as just revalidated."""
+        self.conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+        self.conn.commit()
+        
+    def close(self):
+        """Close the cache database."""
+        self.conn.close()
 
 class ZillowFSBOScraper:
-    def __init__(self, headless=True):
-        """Initialize the scraper with browser options."""
+    def __init__(self, headless=True, page_cache_path='zillow_page_cache.sqlite'):
+        """Initialize the scraper with browser options.
+        
+        page_cache_path is the on-disk cache used by the plain HTTP path; pass None to disable it.
+        """
         self.options = Options()
         if headless:
             self.options.add_argument('--headless')
@@ -21,42 +167,127 @@ class ZillowFSBOScraper:
         self.options.add_argument('--disable-blink-features=AutomationControlled')
         self.options.add_experimental_option('excludeSwitches', ['enable-automation'])
         self.options.add_experimental_option('useAutomationExtension', False)
-        self.options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36')
+        self.options.add_argument(f'user-agent={USER_AGENT}')
+        # Turn off Chrome subsystems the scraper has no use for to cut startup and render time
+        for flag in ('--disable-gpu', '--disable-extensions', '--disable-sync', '--disable-translate',
+                     '--disable-default-apps', '--disable-background-networking', '--no-first-run',
+                     '--blink-settings=imagesEnabled=false',
+                     '--disable-features=Translate,BackForwardCache,AcceptCHFrame'):
+            self.options.add_argument(flag)
+        # Return from get() at DOMContentLoaded; the explicit waits gate on the listings themselves
+        self.options.page_load_strategy = 'eager'
+        # Don't download property photos or web fonts; only the listing markup is used
+        self.options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.managed_default_content_settings.fonts': 2
+        })
         
         self.driver = None
+        self.session = None
+        self.page_cache_path = page_cache_path
+        self.page_cache = None
+        # Listing tuples in LISTING_COLUMNS order
         self.listings = []
         
     def start_browser(self):
-        """Start the Chrome browser."""
+        """Start the Chrome browser, reusing it if it is already running."""
+        if self.driver is not None:
+            return
         self.driver = webdriver.Chrome(options=self.options)
         # Set a reasonable window size
         self.driver.set_window_size(1366, 768)
+        # Block the remaining heavy resources (stylesheets, fonts, trackers) at the network layer
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
         
     def close_browser(self):
         """Close the browser."""
         if self.driver:
             self.driver.quit()
+            self.driver = None
+            
+    async def open_session(self):
+        """Open the shared HTTP session (and page cache) used for browserless fetching."""
+        if self.session is None:
+            # Imported here so aiohttp is only needed when the --no-browser path is used
+            import aiohttp
+            self.session = aiohttp.ClientSession(
+                headers={'User-Agent': USER_AGENT},
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60)
+            )
+        if self.page_cache is None and self.page_cache_path:
+            self.page_cache = PageCache(self.page_cache_path)
+        return self.session
+        
+    async def close_session(self):
+        """Close the shared HTTP session and page cache."""
+        if self.session:
+            await self.session.close()
+            self.session = None
+        if self.page_cache:
+            self.page_cache.close()
+            self.page_cache = None
+            
+    async def _fetch_page_listings(self, url):
+        """Fetch and parse one results page, reusing cached listings when the page is unchanged.
+        
+        Returns the page's listing tuples, or None if the request failed.
+        """
+        session = await self.open_session()
+        cached = self.page_cache.get(url) if self.page_cache else None
+        
+        headers = {}
+        if cached:
+            if cached['fresh']:
+                self.listings.extend(cached['listings'])
+                return cached['listings']
+            # Ask the server to skip the body if nothing changed since the last fetch
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+                
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and cached:
+                self.page_cache.touch(url)
+                self.listings.extend(cached['listings'])
+                return cached['listings']
+            if response.status != 200:
+                print(f"Request for {url} failed with status {response.status}")
+                return None
+            html = await response.text()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            
+        listings = self.parse_listings_page(html)
+        # An empty parse may be a bot challenge or a parse error rather than a real empty page,
+        # so only cache it when the page carried valid search state
+        if self.page_cache and (listings or self._parse_embedded_listings(html) is not None):
+            self.page_cache.store(url, etag, last_modified, listings)
+        return listings
             
     def random_delay(self, min_seconds=2, max_seconds=5):
         """Add random delay between actions to mimic human behavior."""
         time.sleep(random.uniform(min_seconds, max_seconds))
             
     def search_fsbo_listings(self, location, max_pages=3):
-        """Search for FSBO listings in the specified location."""
+        """Search for FSBO listings in the specified location.
+        
+        The browser is left running so it can be reused for the next location;
+        callers are responsible for calling close_browser() when done.
+        """
+        start = len(self.listings)
         try:
-            if not self.driver:
+            if self.driver is None:
                 self.start_browser()
+            else:
+                # Start each location with a clean session instead of a fresh browser
+                self.driver.delete_all_cookies()
                 
-            # Format the Zillow FSBO search URL
-            base_url = f"https://www.zillow.com/homes/for_sale/{location.replace(' ', '-')}"
-            fsbo_url = f"{base_url}/0_fs/"
-            
             print(f"Searching FSBO listings in {location}...")
-            self.driver.get(fsbo_url)
-            self.random_delay(3, 6)
-            
-            # Check for and handle any initial popups
-            self.handle_popups()
+            self.driver.get(fsbo_search_url(location))
+            # The explicit wait below gates on the listings; this is only a little humanizing jitter
+            self.random_delay(0.3, 1.0)
             
             # Iterate through the specified number of pages
             for page in range(1, max_pages + 1):
@@ -70,8 +301,13 @@ class ZillowFSBOScraper:
                 except TimeoutException:
                     print("Timeout waiting for listings to load")
                     
-                # Parse the current page
-                self.parse_listings_page()
+                # With the eager load strategy, modals are injected after DOMContentLoaded,
+                # so sweep for them only once the listings have rendered
+                self.handle_popups()
+                
+                # Parse the current page in the browser, falling back to parsing its HTML
+                if self.parse_rendered_cards() is None:
+                    self.parse_listings_page()
                 
                 # Try to navigate to the next page if not on the last page
                 if page < max_pages:
@@ -79,47 +315,119 @@ class ZillowFSBOScraper:
                         print("No more pages available")
                         break
                         
-            return self.listings
+            return self.listings[start:]
             
         except Exception as e:
             print(f"An error occurred during search: {str(e)}")
-            return self.listings
+            return self.listings[start:]
+            
+    async def fetch_fsbo_listings(self, location, max_pages=3):
+        """Search for FSBO listings in the specified location over plain HTTP, without a browser."""
+        found = []
+        
+        try:
+            print(f"Fetching FSBO listings in {location}...")
+            for page in range(1, max_pages + 1):
+                listings = await self._fetch_page_listings(fsbo_search_url(location, page))
+                if listings is None:
+                    break
+                    
+                print(f"Collected page {page} for {location}")
+                found.extend(listings)
+                
+        except Exception as e:
+            print(f"An error occurred while fetching {location}: {str(e)}")
+            
+        return found
+        
+    async def fetch_all_locations(self, locations, max_pages=3):
+        """Fetch FSBO listings for several locations concurrently over one HTTP session."""
+        try:
+            results = await asyncio.gather(
+                *[self.fetch_fsbo_listings(location, max_pages) for location in locations]
+            )
+        finally:
+            await self.close_session()
+        return [listing for listings in results for listing in listings]
+            
+    async def render_fsbo_listings(self, browser, location, max_pages=3):
+        """Search for FSBO listings in the specified location using a Playwright browser context."""
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
+        found = []
+        # Contexts are cheap to create and isolate cookies/storage per location
+        context = await browser.new_context(user_agent=USER_AGENT, viewport={'width': 1366, 'height': 768})
+        try:
+            page = await context.new_page()
+            print(f"Rendering FSBO listings in {location}...")
+            for page_number in range(1, max_pages + 1):
+                await page.goto(fsbo_search_url(location, page_number))
+                try:
+                    await page.wait_for_selector("ul.photo-cards", timeout=10000)
+                except PlaywrightTimeoutError:
+                    print(f"Timeout waiting for listings to load in {location}")
+                    
+                print(f"Parsing page {page_number} for {location}...")
+                found.extend(self.parse_listings_page(await page.content()))
+                
+        except Exception as e:
+            print(f"An error occurred while rendering {location}: {str(e)}")
         finally:
-            # Make sure to close the browser
-            self.close_browser()
+            await context.close()
+            
+        return found
+        
+    async def render_all_locations(self, locations, max_pages=3, headless=True):
+        """Render FSBO listings for several locations concurrently in one Playwright browser."""
+        # Imported here so Playwright is only needed when the --playwright path is used
+        from playwright.async_api import async_playwright
+        
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=headless)
+            try:
+                results = await asyncio.gather(
+                    *[self.render_fsbo_listings(browser, location, max_pages) for location in locations]
+                )
+            finally:
+                await browser.close()
+        return [listing for listings in results for listing in listings]
             
     def handle_popups(self):
         """Handle common Zillow popups."""
         try:
-            # Check for and close various possible popups
+            # Check for and close various possible popups in one script round-trip
             # This varies based on Zillow's current website design
-            popup_selectors = [
-                "button[aria-label='Close']", 
-                ".modal-dialog .close", 
-                "#sgpd-closeButton",
-                "button.popup-close"
-            ]
-            
-            for selector in popup_selectors:
-                try:
-                    close_buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for button in close_buttons:
-                        if button.is_displayed():
-                            button.click()
-                            self.random_delay(1, 2)
-                except:
-                    continue
-        except:
+            closed = self.driver.execute_script(_CLOSE_POPUPS_JS, POPUP_SELECTORS)
+            if closed:
+                self.random_delay(1, 2)
+        except WebDriverException:
             pass
             
+    def first_card_href(self):
+        """Return the link of the first listing card on the current page, or None."""
+        return self.driver.execute_script(_FIRST_CARD_HREF_JS)
+        
+    def wait_for_page_change(self, old_url, old_first_href):
+        """Wait until the browser has moved on to the next results page and rendered its cards."""
+        try:
+            wait = WebDriverWait(self.driver, 10)
+            # Zillow moves to a /N_p/ URL first, then re-renders the cards (possibly reusing the list node)
+            wait.until(EC.url_changes(old_url))
+            if old_first_href:
+                wait.until(lambda driver: self.first_card_href() != old_first_href)
+        except TimeoutException:
+            print("Timeout waiting for the next page to load")
+            
     def go_to_next_page(self):
         """Attempt to navigate to the next page of results."""
+        old_url = self.driver.current_url
+        old_first_href = self.first_card_href()
         try:
             # Find and click the next page button
             next_button = self.driver.find_element(By.CSS_SELECTOR, "a[title='Next page']")
             if next_button.is_enabled():
                 next_button.click()
-                self.random_delay(3, 6)
+                self.wait_for_page_change(old_url, old_first_href)
                 return True
             return False
         except NoSuchElementException:
@@ -131,89 +439,195 @@ class ZillowFSBOScraper:
                     if 'active' in button.get_attribute('class'):
                         if i + 1 < len(next_buttons):
                             next_buttons[i + 1].click()
-                            self.random_delay(3, 6)
+                            self.wait_for_page_change(old_url, old_first_href)
                             return True
                 return False
             except:
                 return False
                 
-    def parse_listings_page(self):
-        """Parse the current page of listings."""
+    def page_html(self):
+        """Return the browser's current DOM as HTML in a single script round-trip."""
+        # Cheaper than driver.page_source, which goes through a separate WebDriver DOM serialization
+        return self.driver.execute_script("return document.documentElement.outerHTML")
+        
+    def parse_listings_page(self, html=None):
+        """Parse a page of listings, by default the browser's current page, and return the new FSBO listing tuples."""
+        found = []
         try:
-            # Get the page source and create a BeautifulSoup object
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Look for listing cards - this selector may need adjustment based on Zillow's current layout
-            listing_cards = soup.select("ul.photo-cards > li")
-            if not listing_cards:
-                listing_cards = soup.select("div[data-test='property-card']")
-                
-            for card in listing_cards:
-                listing = {}
-                
-                # Check if it's an FSBO listing
-                fsbo_badge = card.select_one(".StyledZillowLogo-c11n-8-84-3__sc-1ly7na1-0")
-                for_sale_by_owner_text = card.find(string=re.compile("For Sale by Owner", re.IGNORECASE))
-                
-                if fsbo_badge or for_sale_by_owner_text:
-                    # Extract address
-                    address_elem = card.select_one("address")
-                    if address_elem:
-                        listing['address'] = address_elem.text.strip()
-                    
-                    # Extract price
-                    price_elem = card.select_one("[data-test='property-card-price']")
-                    if price_elem:
-                        listing['price'] = price_elem.text.strip()
-                    
-                    # Extract bed/bath/sqft info
-                    details_elem = card.select_one("[data-test='property-card-details']")
-                    if details_elem:
-                        details_text = details_elem.text.strip()
-                        
-                        # Parse beds
-                        beds_match = re.search(r"(\d+)\s*bd", details_text)
-                        if beds_match:
-                            listing['beds'] = beds_match.group(1)
-                            
-                        # Parse baths
-                        baths_match = re.search(r"(\d+(?:\.\d+)?)\s*ba", details_text)
-                        if baths_match:
-                            listing['baths'] = baths_match.group(1)
-                            
-                        # Parse square footage
-                        sqft_match = re.search(r"([\d,]+)\s*sqft", details_text)
-                        if sqft_match:
-                            listing['sqft'] = sqft_match.group(1).replace(',', '')
-                    
-                    # Extract listing URL
-                    link_elem = card.select_one("a[href^='/homedetails']")
-                    if link_elem:
-                        href = link_elem['href']
-                        if href.startswith('/'):
-                            listing['url'] = f"https://www.zillow.com{href}"
-                        else:
-                            listing['url'] = href
-                    
-                    # Add the FSBO listing to our collection
-                    if listing:
-                        listing['source'] = 'Zillow FSBO'
-                        print(f"Found FSBO listing: {listing.get('address', 'No address')} - {listing.get('price', 'No price')}")
-                        self.listings.append(listing)
+            if html is None:
+                html = self.page_html()
+                
+            # Prefer the structured search state Zillow embeds in the page; it needs no HTML parsing
+            page_listings = self._parse_embedded_listings(html)
+            if page_listings is None:
+                # Create a BeautifulSoup object from the page HTML using the C-backed lxml parser
+                soup = BeautifulSoup(html, 'lxml')
+                page_listings = self._parse_listing_cards(soup)
+                
+            found = self._record_listings(page_listings)
                         
         except Exception as e:
             print(f"Error parsing listings page: {str(e)}")
             
+        return found
+        
+    def parse_rendered_cards(self):
+        """Extract FSBO listings from the browser's listing cards in one in-page script pass.
+        
+        Returns the new FSBO listing tuples, or None if no cards were found so the caller
+        can fall back to parse_listings_page().
+        """
+        try:
+            cards = self.driver.execute_script(_EXTRACT_CARDS_JS, _CARDS_SELECTOR, _FSBO_BADGE_SELECTOR)
+        except WebDriverException as e:
+            print(f"Error extracting rendered cards: {str(e)}")
+            return None
+        if not cards:
+            return None
+            
+        page_listings = []
+        for card in cards:
+            if not card['fsbo']:
+                continue
+                
+            listing = {}
+            if card['address']:
+                listing['address'] = card['address']
+            if card['price']:
+                listing['price'] = card['price']
+            if card['details']:
+                parse_details(card['details'], listing)
+            if card['url']:
+                listing['url'] = card['url']
+                
+            if listing:
+                page_listings.append(listing)
+        return self._record_listings(page_listings)
+        
+    def _record_listings(self, page_listings):
+        """Add parsed listing dicts to the collection as tuples and return the new tuples."""
+        found = []
+        for listing in page_listings:
+            # Add the FSBO listing to our collection
+            listing['source'] = 'Zillow FSBO'
+            print(f"Found FSBO listing: {listing.get('address', 'No address')} - {listing.get('price', 'No price')}")
+            row = tuple(listing.get(column) for column in LISTING_COLUMNS)
+            self.listings.append(row)
+            found.append(row)
+        return found
+        
+    def _parse_embedded_listings(self, html):
+        """Extract FSBO listings from the page's __NEXT_DATA__ JSON blob, or return None if it is unavailable."""
+        match = _NEXT_DATA_RE.search(html)
+        if not match:
+            return None
+        try:
+            data = orjson.loads(match.group(1))
+            results = data["props"]["pageProps"]["searchPageState"]["cat1"]["searchResults"]["listResults"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            return None
+            
+        listings = []
+        for result in results:
+            home_info = (result.get("hdpData") or {}).get("homeInfo") or {}
+            if not (home_info.get("listing_sub_type") or {}).get("is_FSBO"):
+                continue
+                
+            listing = {}
+            for key, field in (("address", "address"), ("price", "price"), ("beds", "beds"),
+                               ("baths", "baths"), ("sqft", "area")):
+                if result.get(field) is not None:
+                    listing[key] = result[field]
+                    
+            href = result.get("detailUrl")
+            if href:
+                listing['url'] = f"https://www.zillow.com{href}" if href.startswith('/') else href
+                
+            if listing:
+                listings.append(listing)
+        return listings
+        
+    def _parse_listing_cards(self, soup):
+        """Extract FSBO listings from the rendered listing cards."""
+        listings = []
+        
+        # Look for listing cards - this selector may need adjustment based on Zillow's current layout
+        for card in _SEL_CARDS.select(soup):
+            listing = {}
+            
+            # Check if it's an FSBO listing: the badge is a cheap selector lookup, and only
+            # cards without it fall back to a plain substring check on the card text
+            if not _SEL_FSBO_BADGE.select_one(card):
+                if 'for sale by owner' not in card.get_text(' ', strip=True).lower():
+                    continue
+                    
+            # Extract address
+            address_elem = _SEL_ADDRESS.select_one(card)
+            if address_elem:
+                listing['address'] = address_elem.text.strip()
+            
+            # Extract price
+            price_elem = _SEL_PRICE.select_one(card)
+            if price_elem:
+                listing['price'] = price_elem.text.strip()
+            
+            # Extract bed/bath/sqft info
+            details_elem = _SEL_DETAILS.select_one(card)
+            if details_elem:
+                details_text = details_elem.text.strip()
+                
+                parse_details(details_text, listing)
+            
+            # Extract listing URL
+            link_elem = _SEL_LINK.select_one(card)
+            if link_elem:
+                href = link_elem['href']
+                if href.startswith('/'):
+                    listing['url'] = f"https://www.zillow.com{href}"
+                else:
+                    listing['url'] = href
+            
+            if listing:
+                listings.append(listing)
+                
+        return listings
+            
     def save_to_csv(self, filename='zillow_fsbo_listings.csv'):
         """Save the collected listings to a CSV file."""
         if self.listings:
-            df = pd.DataFrame(self.listings)
-            df.to_csv(filename, index=False)
+            with open(filename, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(LISTING_COLUMNS)
+                writer.writerows(self.listings)
             print(f"Saved {len(self.listings)} FSBO listings to {filename}")
         else:
             print("No listings to save")
             
+def scrape_one(location, max_pages=2):
+    """Scrape one location with its own browser; used as a worker in a process pool."""
+    # Selenium drivers are not thread-safe, so each worker process owns a separate one
+    scraper = ZillowFSBOScraper(headless=True)
+    try:
+        return scraper.search_fsbo_listings(location, max_pages=max_pages)
+    finally:
+        scraper.close_browser()
+
+def scrape_in_pool(locations, max_pages=2):
+    """Yield each location's listings as soon as its worker process finishes."""
+    # Scrape locations in parallel, one headless browser per worker process
+    with multiprocessing.Pool(processes=min(len(locations), os.cpu_count() or 1)) as pool:
+        yield from pool.imap_unordered(partial(scrape_one, max_pages=max_pages), locations)
+
 def main():
+    parser = argparse.ArgumentParser(description='Zillow FSBO listing scraper')
+    parser.add_argument('--no-browser', action='store_true',
+                        help='Fetch pages concurrently over plain HTTP instead of driving Chrome')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the on-disk page cache used with --no-browser')
+    parser.add_argument('--playwright', action='store_true',
+                        help='Render pages concurrently with Playwright instead of Selenium')
+    args = parser.parse_args()
+    
     # Example usage
     locations = [
         "New York, NY",
@@ -221,20 +635,36 @@ def main():
         "Chicago, IL"
     ]
     
-    scraper = ZillowFSBOScraper(headless=False)  # Set to True for headless mode
-    
-    all_listings = []
-    for location in locations:
-        listings = scraper.search_fsbo_listings(location, max_pages=2)
-        all_listings.extend(listings)
-        # Add delay between locations to avoid rate limiting
-        time.sleep(random.uniform(10, 20))
-    
-    if all_listings:
-        df = pd.DataFrame(all_listings)
-        df.to_csv('zillow_fsbo_listings.csv', index=False)
-        print(f"Saved total of {len(all_listings)} FSBO listings to zillow_fsbo_listings.csv")
+    # Rows are written as each batch arrives instead of being collected for one big write at the end.
+    # They go to a temporary file that only replaces the previous results once something was found,
+    # so a blocked or empty run leaves the last good CSV in place
+    filename = 'zillow_fsbo_listings.csv'
+    partial_filename = filename + '.part'
+    total = 0
+    with open(partial_filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(LISTING_COLUMNS)
+        
+        if args.no_browser:
+            # All locations are fetched at once, so there is no need for a per-location delay
+            scraper = ZillowFSBOScraper(page_cache_path=None if args.no_cache else 'zillow_page_cache.sqlite')
+            batches = [asyncio.run(scraper.fetch_all_locations(locations, max_pages=2))]
+        elif args.playwright:
+            # One browser, with a separate context per location
+            scraper = ZillowFSBOScraper()
+            batches = [asyncio.run(scraper.render_all_locations(locations, max_pages=2))]
+        else:
+            batches = scrape_in_pool(locations)
+            
+        for listings in batches:
+            writer.writerows(listings)
+            total += len(listings)
+            
+    if total:
+        os.replace(partial_filename, filename)
+        print(f"Saved total of {total} FSBO listings to {filename}")
     else:
+        os.remove(partial_filename)
         print("No FSBO listings found")
 
 if __name__ == "__main__":